@@ -1,7 +1,7 @@
 # app_factory.py
-from dotenv import load_dotenv
 from utils.imports import *
-from extensions import migrate, csrf
+from extensions import migrate, csrf, server_session, config_reloader, compress, profiler, lifecycle
+from utils.config import load_settings
 
 fernet = None
 serializer = None
@@ -9,33 +9,15 @@ serializer = None
 def create_app():
     global fernet, serializer
 
-    load_dotenv()
-
-    # Validate and load SECRET_KEY
-    raw_key = os.getenv("SECRET_KEY")
-    if not raw_key or not raw_key.startswith("base64:"):
-        raise ValueError("SECRET_KEY must be in base64 format")
-
-    decoded_key = base64.b64decode(raw_key.split("base64:")[1])
-    if len(decoded_key) < 32:
-        raise ValueError("SECRET_KEY must decode to at least 32 bytes")
-
-    # Configure database URI
-    database_uri = _build_database_uri()
+    # Typed settings, from the compiled snapshot when it is fresh
+    settings = load_settings()
+    database_uri = settings.database_uri
 
     # Create Flask app and config
     app = Flask(__name__)
-    app.config.update(
-        SECRET_KEY=raw_key,
-        HOST=os.getenv("HOST"),
-        PORT=int(os.getenv("PORT", 5000)),
-        SQLALCHEMY_DATABASE_URI=database_uri,
-        SQLALCHEMY_TRACK_MODIFICATIONS=os.getenv("SQLALCHEMY_TRACK_MODIFICATIONS", "False") == "True",
-        FLASK_ENV=os.getenv("FLASK_ENV", "development"),
-        FLASK_DEBUG=os.getenv("FLASK_DEBUG", "True") == "True",
-        UPLOAD_FOLDER=os.path.join(app.root_path, os.getenv("UPLOAD_FOLDER", "static/uploads")),
-        ALLOWED_EXTENSIONS=set(os.getenv("ALLOWED_EXTENSIONS", "png,jpg,jpeg,gif").split(",")),
-    )
+    app.config.from_mapping(settings.to_flask_config())
+    app.debug = settings.flask_debug
+    app.config["UPLOAD_FOLDER"] = os.path.join(app.root_path, settings.upload_folder)
 
     # Create DB if needed (except SQLite)
     if not database_uri.startswith("sqlite"):
@@ -53,31 +35,15 @@ def create_app():
     db.init_app(app)
     csrf.init_app(app)
     migrate.init_app(app, db)
+    server_session.init_app(app)
+    config_reloader.init_app(app, settings)
+    compress.init_app(app)
+    profiler.init_app(app)
+    lifecycle.init_app(app)
 
     # Initialize crypto utilities
+    decoded_key = settings.decoded_key
     fernet = Fernet(base64.urlsafe_b64encode(decoded_key[:32]))
     serializer = URLSafeTimedSerializer(decoded_key)
 
     return app
-
-def _build_database_uri():
-    driver = os.getenv("DATABASE_DRIVER", "sqlite").lower()
-    user = os.getenv("DATABASE_USER", "")
-    password = os.getenv("DATABASE_PASSWORD", "")
-    host = os.getenv("DATABASE_HOST", "")
-    port = os.getenv("DATABASE_PORT", "")
-    db_name = os.getenv("DATABASE_NAME", "app_data")
-
-    if driver == "sqlite":
-        instance_dir = os.path.abspath("instance")
-        os.makedirs(instance_dir, exist_ok=True)
-        return f"sqlite:///{os.path.join(instance_dir, f'{db_name}.db')}"
-
-    elif driver in ["mysql", "mariadb"]:
-        return f"mysql+pymysql://{user}:{password}@{host}:{port}/{db_name}"
-
-    elif driver in ["postgres", "postgresql"]:
-        return f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{db_name}"
-
-    else:
-        raise ValueError(f"Unsupported DATABASE_DRIVER: {driver}")
\ No newline at end of file
@@ -0,0 +1,24 @@
+import importlib
+
+from . import _registry
+
+__all__ = list(_registry.REGISTRY)
+
+
+def __getattr__(name):
+    # Import the defining module on first access only
+    module_path = _registry.REGISTRY.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_path}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_registry.REGISTRY))
+
+
+def load_all():
+    """Import every registered class, e.g. before Alembic autogenerate."""
+    return {name: __getattr__(name) for name in _registry.REGISTRY}
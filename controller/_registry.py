@@ -0,0 +1,3 @@
+# Generated by `create:controller`. Maps class name -> module, imported lazily.
+REGISTRY = {
+}
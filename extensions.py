@@ -1,5 +1,17 @@
 from flask_migrate import Migrate
 from flask_wtf import CSRFProtect
+from models.search import include_object
+from utils.sessions import ServerSession
+from utils.config import ConfigReloader
+from utils.compression import Compress
+from utils.profiler import Profiler
+from utils.lifecycle import Lifecycle
 
-migrate = Migrate()
+# include_object keeps autogenerate away from full-text index tables/columns
+migrate = Migrate(include_object=include_object)
 csrf = CSRFProtect()
+server_session = ServerSession()
+config_reloader = ConfigReloader()
+compress = Compress()
+profiler = Profiler()
+lifecycle = Lifecycle()
@@ -0,0 +1,5 @@
+# Generated by `create:model`. Maps class name -> module, imported lazily.
+REGISTRY = {
+    "Admin": "admin",
+    "SessionRecord": "session_record",
+}
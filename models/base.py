@@ -0,0 +1,88 @@
+from collections import namedtuple
+from functools import lru_cache
+
+from flask_sqlalchemy.model import Model
+from sqlalchemy import select
+
+
+@lru_cache(maxsize=None)
+def _row_type(model_name, fields):
+    # namedtuples are slotted: no per-row __dict__, ~a tuple's footprint
+    return namedtuple(f"{model_name}Row", fields, rename=True)
+
+
+class ReadOnlyQuery:
+    """Column-only SELECT that yields plain named tuples.
+
+    Rows never enter the session identity map, so nothing is tracked, flushed
+    or refreshed for them. Iterating streams with `yield_per` so memory stays
+    flat however many rows are rendered.
+    """
+
+    __slots__ = ("model", "stmt")
+
+    def __init__(self, model, stmt):
+        self.model = model
+        self.stmt = stmt
+
+    def _chain(self, stmt):
+        return ReadOnlyQuery(self.model, stmt)
+
+    def where(self, *criteria):
+        return self._chain(self.stmt.where(*criteria))
+
+    def filter_by(self, **kwargs):
+        return self._chain(self.stmt.filter_by(**kwargs))
+
+    def order_by(self, *clauses):
+        return self._chain(self.stmt.order_by(*clauses))
+
+    def limit(self, limit):
+        return self._chain(self.stmt.limit(limit))
+
+    def offset(self, offset):
+        return self._chain(self.stmt.offset(offset))
+
+    @property
+    def row_type(self):
+        return _row_type(self.model.__name__, tuple(self.stmt.selected_columns.keys()))
+
+    def _execute(self, stmt):
+        return self.model.__fsa__.session.execute(stmt)
+
+    def all(self):
+        make = self.row_type._make
+        return [make(row) for row in self._execute(self.stmt)]
+
+    def first(self):
+        row = self._execute(self.stmt.limit(1)).first()
+        return None if row is None else self.row_type._make(row)
+
+    def stream(self, yield_per=1000):
+        """Yield rows while fetching `yield_per` at a time from the cursor."""
+        make = self.row_type._make
+        result = self._execute(self.stmt.execution_options(yield_per=yield_per))
+        try:
+            for partition in result.partitions():
+                for row in partition:
+                    yield make(row)
+        finally:
+            result.close()
+
+    def __iter__(self):
+        return self.stream()
+
+
+class BaseModel(Model):
+    """Base class of every `db.Model`."""
+
+    @classmethod
+    def readonly(cls, *columns):
+        """Read-only query over `columns` (names or attributes, default: all).
+
+        e.g. `User.readonly("id", "username").order_by(User.id).stream()`
+        """
+        if not columns:
+            columns = cls.__table__.columns.keys()
+        selected = [getattr(cls, c) if isinstance(c, str) else c for c in columns]
+        return ReadOnlyQuery(cls, select(*selected))
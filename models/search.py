@@ -0,0 +1,201 @@
+from sqlalchemy import event, inspect, text
+
+from . import db
+
+# SQLite FTS5 keeps the virtual table plus these shadow tables
+FTS_SUFFIXES = ("_fts", "_fts_data", "_fts_idx", "_fts_content", "_fts_docsize", "_fts_config")
+
+
+class SearchableMixin:
+    """Indexed full-text search over the columns listed in `__searchable__`.
+
+    SQLite keeps an external-content FTS5 table (`<table>_fts`) and Postgres a
+    trigger-maintained `search_vector` tsvector with a GIN index; both are kept
+    in sync by database triggers on every write. Other drivers fall back to LIKE.
+
+    Alembic migrations don't create the index: it is built (and filled from
+    existing rows) by `sync_search_index`, which runs after `migrate`, during
+    worker warmup and before the first search of each process.
+    """
+
+    __searchable__ = []
+    __search_language__ = "english"
+
+    # === Index DDL ===
+    @classmethod
+    def _search_ddl(cls, dialect):
+        table = cls.__tablename__
+        fields = cls.__searchable__
+        if dialect == "sqlite":
+            fts = f"{table}_fts"
+            cols = ", ".join(fields)
+            new = ", ".join(f"new.{f}" for f in fields)
+            old = ", ".join(f"old.{f}" for f in fields)
+            return [
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({cols}, content='{table}', content_rowid='id')",
+                f"CREATE TRIGGER IF NOT EXISTS {table}_fts_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+                f"CREATE TRIGGER IF NOT EXISTS {table}_fts_ad AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+                f"CREATE TRIGGER IF NOT EXISTS {table}_fts_au AFTER UPDATE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+                f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+            ]
+        if dialect == "postgresql":
+            return [
+                f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector",
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING GIN (search_vector)",
+                f"CREATE OR REPLACE FUNCTION {table}_search_update() RETURNS trigger AS $$ BEGIN "
+                f"NEW.search_vector := {cls._tsvector_sql('NEW')}; RETURN NEW; END $$ LANGUAGE plpgsql",
+                f"DROP TRIGGER IF EXISTS {table}_search_trg ON {table}",
+                f"CREATE TRIGGER {table}_search_trg BEFORE INSERT OR UPDATE ON {table} "
+                f"FOR EACH ROW EXECUTE FUNCTION {table}_search_update()",
+            ]
+        return []
+
+    @classmethod
+    def _tsvector_sql(cls, row):
+        prefix = f"{row}." if row else ""
+        joined = " || ' ' || ".join(f"coalesce({prefix}{f}::text, '')" for f in cls.__searchable__)
+        return f"to_tsvector('{cls.__search_language__}', {joined})"
+
+    @classmethod
+    def ensure_search_index(cls, connection):
+        """Create the index structures if missing (idempotent)."""
+        for statement in cls._search_ddl(connection.dialect.name):
+            connection.exec_driver_sql(statement)
+
+    @classmethod
+    def _search_index_exists(cls, connection):
+        table = cls.__tablename__
+        dialect = connection.dialect.name
+        if dialect == "sqlite":
+            sql, name = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name", f"{table}_fts"
+        elif dialect == "postgresql":
+            sql, name = "SELECT 1 FROM pg_trigger WHERE tgname = :name", f"{table}_search_trg"
+        else:
+            return True
+        return connection.execute(text(sql), {"name": name}).first() is not None
+
+    @classmethod
+    def sync_search_index(cls):
+        """Build the index from existing rows if it is missing, once per class
+        and process. Returns True if it had to be built."""
+        if cls.__dict__.get("_search_ready"):
+            return False
+        with db.engine.connect() as conn:
+            if not inspect(conn).has_table(cls.__tablename__):
+                # Table not migrated yet; check again next time
+                return False
+            missing = not cls._search_index_exists(conn)
+        if missing:
+            cls.reindex()
+        cls._search_ready = True
+        return missing
+
+    # === Query API ===
+    @classmethod
+    def search(cls, q, limit=20):
+        """Return up to `limit` instances matching `q`, best match first."""
+        terms = q.split()
+        if not terms:
+            return []
+        cls.sync_search_index()
+        dialect = db.engine.dialect.name
+        table = cls.__tablename__
+
+        if dialect == "sqlite":
+            # Quote every term so user input can't break FTS5 query syntax
+            match = " ".join('"{}"'.format(t.replace('"', '""')) for t in terms)
+            rows = db.session.execute(
+                text(f"SELECT rowid FROM {table}_fts WHERE {table}_fts MATCH :q ORDER BY bm25({table}_fts) LIMIT :limit"),
+                {"q": match, "limit": limit},
+            )
+        elif dialect == "postgresql":
+            rows = db.session.execute(
+                text(
+                    f"SELECT id FROM {table}, websearch_to_tsquery(:lang, :q) query "
+                    f"WHERE search_vector @@ query ORDER BY ts_rank(search_vector, query) DESC LIMIT :limit"
+                ),
+                {"lang": cls.__search_language__, "q": q, "limit": limit},
+            )
+        else:
+            columns = [getattr(cls, f) for f in cls.__searchable__]
+            criteria = [db.or_(*(c.ilike(f"%{t}%") for c in columns)) for t in terms]
+            return cls.query.filter(*criteria).limit(limit).all()
+
+        ids = [row[0] for row in rows]
+        if not ids:
+            return []
+        by_id = {obj.id: obj for obj in cls.query.filter(cls.id.in_(ids))}
+        return [by_id[i] for i in ids if i in by_id]
+
+    @classmethod
+    def reindex(cls, batch_size=1000, progress=None):
+        """Rebuild the search index in id-ordered batches, one commit each."""
+        dialect = db.engine.dialect.name
+        table = cls.__tablename__
+        cols = ", ".join(cls.__searchable__)
+
+        with db.engine.begin() as conn:
+            cls.ensure_search_index(conn)
+            if dialect == "sqlite":
+                conn.exec_driver_sql(f"INSERT INTO {table}_fts({table}_fts) VALUES ('delete-all')")
+        if dialect not in ("sqlite", "postgresql"):
+            return 0
+
+        last_id, total = 0, 0
+        while True:
+            with db.engine.begin() as conn:
+                upper = conn.execute(
+                    text(f"SELECT max(id) FROM (SELECT id FROM {table} WHERE id > :last ORDER BY id LIMIT :batch) b"),
+                    {"last": last_id, "batch": batch_size},
+                ).scalar()
+                if upper is None:
+                    break
+                params = {"last": last_id, "upper": upper}
+                if dialect == "sqlite":
+                    result = conn.execute(text(
+                        f"INSERT INTO {table}_fts(rowid, {cols}) SELECT id, {cols} FROM {table} "
+                        f"WHERE id > :last AND id <= :upper"
+                    ), params)
+                else:
+                    result = conn.execute(text(
+                        f"UPDATE {table} SET search_vector = {cls._tsvector_sql(None)} "
+                        f"WHERE id > :last AND id <= :upper"
+                    ), params)
+            total += result.rowcount
+            last_id = upper
+            if progress:
+                progress(total)
+        return total
+
+
+@event.listens_for(SearchableMixin, "instrument_class", propagate=True)
+def _register_search_ddl(mapper, cls):
+    # db.create_all() builds the index right after the table
+    event.listen(cls.__table__, "after_create", lambda target, connection, **kw: cls.ensure_search_index(connection))
+
+
+def searchable_models():
+    return [m.class_ for m in db.Model.registry.mappers if issubclass(m.class_, SearchableMixin)]
+
+
+def sync_search_indexes():
+    """Build missing indexes for every loaded searchable model; returns their names."""
+    return [cls.__name__ for cls in searchable_models() if cls.sync_search_index()]
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Alembic filter: keep autogenerate from dropping the search artifacts,
+    which live outside the model metadata."""
+    if not reflected or compare_to is not None:
+        return True
+    tables = {cls.__tablename__ for cls in searchable_models()}
+    if type_ == "table":
+        return not any(name == f"{table}{suffix}" for table in tables for suffix in FTS_SUFFIXES)
+    if type_ == "column" and name == "search_vector":
+        return object.table.name not in tables
+    if type_ == "index":
+        return not any(name == f"ix_{table}_search_vector" for table in tables)
+    return True
@@ -0,0 +1,8 @@
+from . import db
+
+
+class SessionRecord(db.Model):
+    __tablename__ = 'sessions'
+    sid = db.Column(db.String(64), primary_key=True)
+    data = db.Column(db.LargeBinary, nullable=False)
+    expires_at = db.Column(db.Float, nullable=False, index=True)
@@ -1,19 +1,25 @@
 try:
     from utils.imports import *
     from app_factory import create_app
+    from extensions import lifecycle
     from models import db  
-    from routes import web
     import argparse
     from utils.scripts.commands import *
 
 except ImportError as e:
+    # Only a missing third-party package means setup is needed; a broken
+    # import inside the app itself must surface as-is
+    if e.name is None or e.name.split(".")[0] in ("utils", "app_factory", "extensions", "models", "controller", "routes"):
+        raise
     print(f"{e}")
+    import sys
     from utils.scripts.commands import *
-    import argparse
     print("⚠️ Failed to Import Dependencies!!!")
     print("Entering Setup Mode...")
-    run_setup()
-    print("✅ Setup Complete! Good To Move On!")
+    # A dependency is missing, so the cached step state can't be trusted
+    run_setup(force=True)
+    print("✅ Setup Complete! Re-run your command inside the project environment.")
+    sys.exit(0 if sys.argv[1:2] == ["setup"] else 1)
 
 
 def cli():
@@ -23,7 +29,8 @@ def cli():
     )
     subparsers = parser.add_subparsers(dest="command", help="Available subcommands")
 
-    subparsers.add_parser("setup", help="Install Python and Tailwind dependencies")
+    parser_setup = subparsers.add_parser("setup", help="Install Python and Tailwind dependencies")
+    parser_setup.add_argument('--force', action='store_true', help='Re-run every step even if its inputs are unchanged')
 
     parser_env = subparsers.add_parser("create:env", help="Generate a secure .env file with SECRET_KEY")
     parser_env.add_argument('--force', action='store_true', help='Force overwrite existing .env file')
@@ -31,6 +38,7 @@ def cli():
     parser_run = subparsers.add_parser("runserver", help="Start the Flask web server")
     parser_run.add_argument('--host', default='127.0.0.1', help='Set the host address (default: 127.0.0.1)')
     parser_run.add_argument('--port', type=int, default=5000, help='Set the port number (default: 5000)')
+    parser_run.add_argument('--no-reload', action='store_true', help='Disable incremental hot reload of controllers, models and templates')
 
     parser_ctrl = subparsers.add_parser("create:controller", help="Generate a new controller")
     parser_ctrl.add_argument("name", help="Name of the controller")
@@ -40,6 +48,7 @@ def cli():
 
     parser_model = subparsers.add_parser("create:model", help="Generate a new model")
     parser_model.add_argument("name", help="Name of the model")
+    parser_model.add_argument("--searchable", help="Comma-separated text fields to full-text index (e.g. title,body)")
 
     parser_all = subparsers.add_parser("create:all", help="Create controller, model, and template together")
     parser_all.add_argument("name", help="Name of the component to create")
@@ -63,23 +72,52 @@ def cli():
     parser_drop = subparsers.add_parser("migrate:drop", help="Drop tables from the database")
     parser_drop.add_argument("target", help="'all' or model name (e.g., Admin, User)")
 
+    parser_sweep = subparsers.add_parser("session:sweep", help="Delete expired server-side sessions")
+    parser_sweep.add_argument('--batch', type=int, default=500, help='Sessions deleted per batch (default: 500)')
+
+    subparsers.add_parser("config:compile", help="Validate .env and write a config snapshot for fast boot")
+    subparsers.add_parser("config:reload", help="Publish reloadable config keys to running workers")
+
+    parser_bench = subparsers.add_parser("bench:render", help="Benchmark TTFB and bytes for buffered vs streamed, gzipped pages")
+    parser_bench.add_argument('--rows', type=int, default=5000, help='Rows rendered per page (default: 5000)')
+
+    parser_profile = subparsers.add_parser("profile:report", help="Aggregate request profiles per endpoint into flamegraph-ready stacks")
+    parser_profile.add_argument('--endpoint', help='Only report this endpoint')
+    parser_profile.add_argument('--output', help='Write collapsed stacks to this file')
+    parser_profile.add_argument('--top', type=int, default=10, help='Hottest frames shown per endpoint (default: 10)')
+
+    subparsers.add_parser("profile:token", help="Print a signed header value that forces profiling of a request")
+
+    parser_reindex = subparsers.add_parser("search:reindex", help="Rebuild full-text search indexes in batches")
+    parser_reindex.add_argument("model", nargs='?', help="Searchable model name (default: all)")
+    parser_reindex.add_argument('--batch', type=int, default=1000, help='Rows per batch (default: 1000)')
+
     args = parser.parse_args()
 
     if args.command == "setup":
         print("🔧 Running setup...")
-        run_setup()
+        run_setup(force=args.force)
 
     elif args.command == "create:env":
         print("🔐 Generating .env file...")
         generate_env(force=args.force)
 
     elif args.command == "runserver":
+        from routes import web
         app = create_app()
         with app.app_context():
             web.setupRoute(app)
-            start_tailwind_watch()
+            tailwind = start_tailwind_watch()
+            lifecycle.start(app)
+            reloader = None if args.no_reload else start_dev_reloader(app)
             print("🚀 Starting Flask server...")
-            app.run(host=args.host, port=args.port)
+            try:
+                app.run(host=args.host, port=args.port, use_reloader=False)
+            finally:
+                if reloader:
+                    reloader.stop()
+                if tailwind:
+                    tailwind.stop()
 
     elif args.command == "create:controller":
         print(f"🧩 Creating controller: {args.name}")
@@ -87,7 +125,7 @@ def cli():
 
     elif args.command == "create:model":
         print(f"📦 Creating model: {args.name}")
-        create_model(args.name)
+        create_model(args.name, args.searchable)
 
     elif args.command == "migrate:init":
         app = create_app()
@@ -128,6 +166,32 @@ def cli():
             else:
                 drop_table_by_name(app, args.target)
 
+    elif args.command == "session:sweep":
+        app = create_app()
+        with app.app_context():
+            sweep_sessions(app, args.batch)
+
+    elif args.command == "config:compile":
+        compile_config()
+
+    elif args.command == "config:reload":
+        reload_config()
+
+    elif args.command == "bench:render":
+        benchmark_render(args.rows)
+
+    elif args.command == "profile:report":
+        app = create_app()
+        profile_report(app, args.endpoint, args.output, args.top)
+
+    elif args.command == "profile:token":
+        create_app()
+        profile_token()
+
+    elif args.command == "search:reindex":
+        app = create_app()
+        search_reindex(app, args.model, args.batch)
+
     else:
         parser.print_help()
 
@@ -0,0 +1,91 @@
+# utils/compression.py
+import time, zlib
+
+from flask import request
+
+COMPRESSIBLE_MIMETYPES = {
+    "text/html", "text/css", "text/plain", "text/xml", "text/csv",
+    "text/javascript", "application/javascript", "application/json",
+    "application/xml", "image/svg+xml",
+}
+
+
+def _gzip_stream(chunks, level, flush_size=4096, flush_interval=0.02):
+    """Gzip an iterable lazily, flushing every chunk until `flush_size` bytes
+    have gone out so the <head> never waits in the compressor on slow data.
+    After that, output is flushed once `flush_size` bytes are pending or
+    `flush_interval` seconds have passed, avoiding a flush per tiny Jinja chunk."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    eager = flush_size
+    pending = 0
+    last_flush = time.monotonic()
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if not chunk:
+                continue
+            data = compressor.compress(chunk)
+            pending += len(chunk)
+            now = time.monotonic()
+            if eager > 0 or pending >= flush_size or now - last_flush >= flush_interval:
+                data += compressor.flush(zlib.Z_SYNC_FLUSH)
+                eager -= pending
+                pending = 0
+                last_flush = now
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+class Compress:
+    """Gzips text responses above COMPRESS_MIN_SIZE, including streamed ones.
+
+    Already-compressed types (images, archives, fonts, ...) are left alone
+    because only COMPRESS_MIMETYPES are considered.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("COMPRESS_MIN_SIZE", 500)
+        app.config.setdefault("COMPRESS_LEVEL", 6)
+        app.config.setdefault("COMPRESS_MIMETYPES", COMPRESSIBLE_MIMETYPES)
+        app.config.setdefault("COMPRESS_STREAM_FLUSH_SIZE", 4096)
+        app.extensions["compress"] = self
+        app.after_request(lambda response: self.compress(app, response))
+
+    def compress(self, app, response):
+        config = app.config
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in config["COMPRESS_MIMETYPES"]
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        if not request.accept_encodings["gzip"]:
+            return response
+
+        level = config["COMPRESS_LEVEL"]
+        if response.is_streamed:
+            response.response = _gzip_stream(response.response, level, config["COMPRESS_STREAM_FLUSH_SIZE"])
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < config["COMPRESS_MIN_SIZE"]:
+                return response
+            compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            response.set_data(compressor.compress(data) + compressor.flush())
+
+        response.headers["Content-Encoding"] = "gzip"
+        return response
@@ -0,0 +1,372 @@
+# utils/config.py
+import base64, hashlib, json, os, signal, threading, time
+from dataclasses import asdict, dataclass, replace
+
+from dotenv import dotenv_values, load_dotenv
+
+ENV_PATH = ".env"
+SNAPSHOT_PATH = os.path.join("instance", "config.snapshot.json")
+RELOAD_PATH = os.path.join("instance", "config.reload.json")
+
+# Process environment as inherited, before .env was layered under it
+_boot_environ = None
+
+# Every variable Settings.from_env reads; part of the snapshot fingerprint
+ENV_KEYS = (
+    "SECRET_KEY", "HOST", "PORT", "FLASK_ENV", "FLASK_DEBUG",
+    "DATABASE_DRIVER", "DATABASE_USER", "DATABASE_PASSWORD", "DATABASE_HOST", "DATABASE_PORT", "DATABASE_NAME",
+    "SQLALCHEMY_TRACK_MODIFICATIONS", "UPLOAD_FOLDER", "ALLOWED_EXTENSIONS",
+    "DB_POOL_SIZE", "DB_MAX_OVERFLOW", "CONFIG_RELOAD_CHECK_INTERVAL",
+    "SESSION_BACKEND", "SESSION_FILE_DIR", "SESSION_CACHE_SIZE", "SESSION_CACHE_TTL",
+    "SESSION_SWEEP_INTERVAL", "SESSION_SWEEP_BATCH", "SESSION_REFRESH_INTERVAL",
+    "COMPRESS_MIN_SIZE", "COMPRESS_LEVEL", "PROFILE_SAMPLE_RATE", "DRAIN_TIMEOUT", "DRAIN_GRACE_PERIOD",
+)
+
+# Keys that can change on a running worker without a restart
+RELOADABLE_KEYS = (
+    "db_pool_size",
+    "db_max_overflow",
+    "session_cache_size",
+    "session_cache_ttl",
+    "session_sweep_interval",
+    "session_sweep_batch",
+    "session_refresh_interval",
+    "compress_min_size",
+    "compress_level",
+    "profile_sample_rate",
+)
+
+
+# === Typed Settings ===
+@dataclass(frozen=True)
+class Settings:
+    secret_key: str
+    host: str | None
+    port: int
+    database_uri: str
+    track_modifications: bool
+    flask_env: str
+    flask_debug: bool
+    upload_folder: str
+    allowed_extensions: tuple
+    db_pool_size: int
+    db_max_overflow: int
+    config_reload_check_interval: float
+    session_backend: str
+    session_file_dir: str
+    session_cache_size: int
+    session_cache_ttl: int
+    session_sweep_interval: int
+    session_sweep_batch: int
+    session_refresh_interval: int
+    compress_min_size: int
+    compress_level: int
+    profile_sample_rate: float
+    drain_timeout: int
+    drain_grace_period: float
+
+    @classmethod
+    def from_env(cls, environ=None):
+        """Parse and validate settings from `environ` (default: the process environment)."""
+        env = os.environ if environ is None else environ
+        settings = cls(
+            secret_key=env.get("SECRET_KEY", ""),
+            host=env.get("HOST"),
+            port=_env_int(env, "PORT", 5000),
+            database_uri=_build_database_uri(env),
+            track_modifications=_env_bool(env, "SQLALCHEMY_TRACK_MODIFICATIONS", False),
+            flask_env=env.get("FLASK_ENV", "development"),
+            flask_debug=_env_bool(env, "FLASK_DEBUG", True),
+            upload_folder=env.get("UPLOAD_FOLDER", "static/uploads"),
+            allowed_extensions=tuple(env.get("ALLOWED_EXTENSIONS", "png,jpg,jpeg,gif").split(",")),
+            db_pool_size=_env_int(env, "DB_POOL_SIZE", 5),
+            db_max_overflow=_env_int(env, "DB_MAX_OVERFLOW", 10),
+            config_reload_check_interval=_env_float(env, "CONFIG_RELOAD_CHECK_INTERVAL", 1.0),
+            session_backend=env.get("SESSION_BACKEND", "filesystem"),
+            session_file_dir=os.path.abspath(env.get("SESSION_FILE_DIR", os.path.join("instance", "sessions"))),
+            session_cache_size=_env_int(env, "SESSION_CACHE_SIZE", 1024),
+            session_cache_ttl=_env_int(env, "SESSION_CACHE_TTL", 5),
+            session_sweep_interval=_env_int(env, "SESSION_SWEEP_INTERVAL", 300),
+            session_sweep_batch=_env_int(env, "SESSION_SWEEP_BATCH", 500),
+            session_refresh_interval=_env_int(env, "SESSION_REFRESH_INTERVAL", 60),
+            compress_min_size=_env_int(env, "COMPRESS_MIN_SIZE", 500),
+            compress_level=_env_int(env, "COMPRESS_LEVEL", 6),
+            profile_sample_rate=_env_float(env, "PROFILE_SAMPLE_RATE", 0.0),
+            drain_timeout=_env_int(env, "DRAIN_TIMEOUT", 30),
+            drain_grace_period=_env_float(env, "DRAIN_GRACE_PERIOD", 5.0),
+        )
+        settings.validate()
+        return settings
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        data["allowed_extensions"] = tuple(data["allowed_extensions"])
+        return cls(**data)
+
+    def validate(self):
+        if not self.secret_key.startswith("base64:"):
+            raise ValueError("SECRET_KEY must be in base64 format")
+        if len(self.decoded_key) < 32:
+            raise ValueError("SECRET_KEY must decode to at least 32 bytes")
+        if self.db_pool_size < 1 or self.db_max_overflow < 0:
+            raise ValueError("DB_POOL_SIZE must be >= 1 and DB_MAX_OVERFLOW >= 0")
+        if not 1 <= self.compress_level <= 9:
+            raise ValueError("COMPRESS_LEVEL must be between 1 and 9")
+        if not 0 <= self.profile_sample_rate <= 1:
+            raise ValueError("PROFILE_SAMPLE_RATE must be between 0 and 1")
+
+    @property
+    def decoded_key(self):
+        return base64.b64decode(self.secret_key.split("base64:", 1)[1])
+
+    def reloadable(self):
+        return {key: getattr(self, key) for key in RELOADABLE_KEYS}
+
+    def to_flask_config(self):
+        """Map settings onto the Flask config keys used across the app."""
+        config = {
+            "SECRET_KEY": self.secret_key,
+            "HOST": self.host,
+            "PORT": self.port,
+            "SQLALCHEMY_DATABASE_URI": self.database_uri,
+            "SQLALCHEMY_TRACK_MODIFICATIONS": self.track_modifications,
+            "FLASK_ENV": self.flask_env,
+            "FLASK_DEBUG": self.flask_debug,
+            "ALLOWED_EXTENSIONS": set(self.allowed_extensions),
+            "SESSION_BACKEND": self.session_backend,
+            "SESSION_FILE_DIR": self.session_file_dir,
+            "DRAIN_TIMEOUT": self.drain_timeout,
+            "DRAIN_GRACE_PERIOD": self.drain_grace_period,
+            "CONFIG_RELOAD_CHECK_INTERVAL": self.config_reload_check_interval,
+            # File-backed SQLite uses a QueuePool as well, so this applies to every driver
+            "SQLALCHEMY_ENGINE_OPTIONS": {
+                "pool_size": self.db_pool_size,
+                "max_overflow": self.db_max_overflow,
+            },
+        }
+        config.update({key.upper(): value for key, value in self.reloadable().items()})
+        return config
+
+
+def _env_int(env, name, default):
+    value = env.get(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}")
+
+
+def _env_float(env, name, default):
+    value = env.get(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {value!r}")
+
+
+def _env_bool(env, name, default):
+    value = env.get(name)
+    if value is None:
+        return default
+    return value.strip() == "True"
+
+
+def _build_database_uri(env):
+    driver = env.get("DATABASE_DRIVER", "sqlite").lower()
+    user = env.get("DATABASE_USER", "")
+    password = env.get("DATABASE_PASSWORD", "")
+    host = env.get("DATABASE_HOST", "")
+    port = env.get("DATABASE_PORT", "")
+    db_name = env.get("DATABASE_NAME", "app_data")
+
+    if driver == "sqlite":
+        instance_dir = os.path.abspath("instance")
+        os.makedirs(instance_dir, exist_ok=True)
+        return f"sqlite:///{os.path.join(instance_dir, f'{db_name}.db')}"
+
+    elif driver in ["mysql", "mariadb"]:
+        return f"mysql+pymysql://{user}:{password}@{host}:{port}/{db_name}"
+
+    elif driver in ["postgres", "postgresql"]:
+        return f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{db_name}"
+
+    else:
+        raise ValueError(f"Unsupported DATABASE_DRIVER: {driver}")
+
+
+# === Snapshot ===
+def _env_fingerprint(env_path=ENV_PATH):
+    # Covers .env plus the process environment as inherited (before .env was
+    # loaded), which takes precedence over .env when the snapshot is not used.
+    digest = hashlib.sha256()
+    if os.path.exists(env_path):
+        with open(env_path, "rb") as f:
+            digest.update(f.read())
+    boot = os.environ if _boot_environ is None else _boot_environ
+    environ = {key: boot[key] for key in ENV_KEYS if key in boot}
+    digest.update(json.dumps(environ, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def _write_json(path, data, mode=0o600):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def compile_snapshot(path=SNAPSHOT_PATH):
+    """Validate the current environment and freeze it into a snapshot file."""
+    fingerprint = _env_fingerprint()
+    load_dotenv()
+    settings = Settings.from_env()
+    _write_json(path, {"fingerprint": fingerprint, "settings": asdict(settings)})
+    return settings
+
+
+def load_settings(path=SNAPSHOT_PATH):
+    """Return settings from a fresh snapshot, falling back to the environment.
+
+    `.env` is loaded under the process environment either way, so keys
+    outside Settings (mail, API keys, FLASK_DEBUG for `app.run`) stay visible.
+    """
+    global _boot_environ
+    if _boot_environ is None:
+        _boot_environ = dict(os.environ)
+    fingerprint = _env_fingerprint()
+    load_dotenv()
+    if os.path.exists(path):
+        try:
+            with open(path, "r") as f:
+                snapshot = json.load(f)
+            if snapshot.get("fingerprint") == fingerprint:
+                return Settings.from_dict(snapshot["settings"])
+            print("⚠️ Config snapshot is stale (.env or environment changed), loading from environment.")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️ Ignoring unreadable config snapshot: {e}")
+
+    return Settings.from_env()
+
+
+# === Hot Reload ===
+def publish_reload():
+    """Re-read the environment and publish safe keys to every worker.
+
+    Unsafe keys (database URI, secret key, ...) still need a restart. The
+    current `.env` is layered under the environment the process booted with,
+    the same precedence as at startup.
+    """
+    boot = dict(os.environ) if _boot_environ is None else _boot_environ
+    env_file = {key: value for key, value in dotenv_values(ENV_PATH).items() if value is not None}
+    settings = Settings.from_env({**env_file, **boot})
+    _write_json(RELOAD_PATH, {"published_at": time.time(), "settings": settings.reloadable()})
+    return settings
+
+
+class ConfigReloader:
+    """Applies published safe keys between requests, at most once per interval."""
+
+    def __init__(self, app=None, settings=None):
+        self.settings = settings
+        self.check_interval = 1.0
+        self._next_check = 0.0
+        self._last_mtime = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, settings)
+
+    def init_app(self, app, settings):
+        self.settings = settings
+        self.check_interval = settings.config_reload_check_interval
+        self._last_mtime = self._mtime()
+        app.extensions["config_reloader"] = self
+        app.before_request(lambda: self.check(app))
+        self._install_sighup()
+
+    def _mtime(self):
+        try:
+            return os.stat(RELOAD_PATH).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _install_sighup(self):
+        if not hasattr(signal, "SIGHUP") or threading.current_thread() is not threading.main_thread():
+            return
+
+        def handle_sighup(signum, frame):
+            # Only publish here; each worker applies on its next request
+            try:
+                publish_reload()
+                print("🔄 SIGHUP: published reloadable config.")
+            except Exception as e:
+                print(f"❌ Config reload failed, keeping current values: {e}")
+
+        signal.signal(signal.SIGHUP, handle_sighup)
+
+    def check(self, app):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._next_check = now + self.check_interval
+            mtime = self._mtime()
+            if mtime is None or mtime == self._last_mtime:
+                return
+            self._last_mtime = mtime
+            with open(RELOAD_PATH, "r") as f:
+                published = json.load(f)["settings"]
+            self.apply(app, published)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Failed to apply reloaded config: {e}")
+        finally:
+            self._lock.release()
+
+    def apply(self, app, values):
+        values = {key: type(getattr(self.settings, key))(values[key]) for key in RELOADABLE_KEYS if key in values}
+        changed = {k: v for k, v in values.items() if getattr(self.settings, k) != v}
+        if not changed:
+            return
+        self.settings = replace(self.settings, **changed)
+        app.config.update({key.upper(): value for key, value in changed.items()})
+        _apply_session_settings(app, self.settings)
+        _apply_pool_settings(app, self.settings)
+        print(f"🔄 Reloaded config: {', '.join(sorted(changed))}")
+
+
+def _apply_session_settings(app, settings):
+    interface = app.session_interface
+    cache = getattr(interface, "cache", None)
+    if cache is None:
+        return
+    cache.maxsize = settings.session_cache_size
+    cache.ttl = settings.session_cache_ttl
+    interface.sweep_interval = settings.session_sweep_interval
+    interface.sweep_batch = settings.session_sweep_batch
+    interface.refreshed.ttl = settings.session_refresh_interval
+
+
+def _apply_pool_settings(app, settings):
+    # QueuePool has no public resize. Its overflow counter starts at
+    # -pool_size, so shift it by the size delta to keep pooled and
+    # checked-out connections accounted for across the change.
+    from models import db
+    pool = db.engine.pool
+    queue = getattr(pool, "_pool", None)
+    if queue is None or not hasattr(pool, "_overflow_lock"):
+        return
+    with pool._overflow_lock:
+        pool._overflow += queue.maxsize - settings.db_pool_size
+        queue.maxsize = settings.db_pool_size
+        pool._max_overflow = settings.db_max_overflow
+
+
+__all__ = ["Settings", "RELOADABLE_KEYS", "load_settings", "compile_snapshot", "publish_reload", "ConfigReloader"]
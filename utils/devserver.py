@@ -0,0 +1,394 @@
+# utils/devserver.py
+import ctypes, ctypes.util, importlib, os, platform, select, signal, struct
+import subprocess, sys, threading, time, atexit
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+WATCH_DIRS = ("controller", "models", "routes", "templates")
+WATCH_SUFFIXES = (".py", ".html")
+# Shared by every model/controller; a change to these needs a restart
+RESTART_MODULES = ("models", "models.base", "models.search", "controller")
+
+
+# === File Watchers ===
+class PollingWatcher:
+    """Portable fallback: compares mtimes of watched files on an interval."""
+
+    def __init__(self, roots, on_change, interval=0.5):
+        self.roots = [str(r) for r in roots]
+        self.on_change = on_change
+        self.interval = interval
+        self._stop = threading.Event()
+
+    def _snapshot(self):
+        mtimes = {}
+        for root in self.roots:
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [d for d in dirnames if d != "__pycache__"]
+                for filename in filenames:
+                    if filename.endswith(WATCH_SUFFIXES):
+                        path = os.path.join(dirpath, filename)
+                        try:
+                            mtimes[path] = os.stat(path).st_mtime_ns
+                        except FileNotFoundError:
+                            continue
+        return mtimes
+
+    def run(self):
+        previous = self._snapshot()
+        while not self._stop.wait(self.interval):
+            current = self._snapshot()
+            changed = {p for p, m in current.items() if previous.get(p) != m}
+            changed |= previous.keys() - current.keys()
+            previous = current
+            if changed:
+                self.on_change(changed)
+
+    def stop(self):
+        self._stop.set()
+
+
+class InotifyWatcher:
+    """Linux inotify watcher (via libc), recursive over the watched roots."""
+
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, roots, on_change, debounce=0.1):
+        libc_name = ctypes.util.find_library("c")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.on_change = on_change
+        self.debounce = debounce
+        self.dirs = {}
+        self._stop = threading.Event()
+        for root in roots:
+            for dirpath, dirnames, _ in os.walk(root):
+                dirnames[:] = [d for d in dirnames if d != "__pycache__"]
+                self._add_watch(dirpath)
+
+    def _add_watch(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK)
+        if wd >= 0:
+            self.dirs[wd] = path
+
+    def _read_events(self):
+        changed = set()
+        try:
+            buf = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(buf):
+            wd, mask, _, length = self.EVENT.unpack_from(buf, offset)
+            offset += self.EVENT.size
+            name = buf[offset:offset + length].rstrip(b"\0").decode()
+            offset += length
+            directory = self.dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO) and name != "__pycache__":
+                    self._add_watch(path)
+            elif name.endswith(WATCH_SUFFIXES):
+                changed.add(path)
+        return changed
+
+    def run(self):
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([self.fd], [], [], 0.5)
+                if not ready:
+                    continue
+                changed = self._read_events()
+                # Editors save in bursts (write, rename, chmod); coalesce them
+                deadline = time.monotonic() + self.debounce
+                while time.monotonic() < deadline:
+                    ready, _, _ = select.select([self.fd], [], [], max(0, deadline - time.monotonic()))
+                    if ready:
+                        changed |= self._read_events()
+                if changed:
+                    self.on_change(changed)
+        finally:
+            os.close(self.fd)
+
+    def stop(self):
+        self._stop.set()
+
+
+def make_watcher(roots, on_change):
+    """Prefer inotify on Linux, fall back to polling elsewhere or on failure."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(roots, on_change)
+        except (OSError, AttributeError) as e:
+            print(f"⚠️ inotify unavailable ({e}), falling back to polling.")
+    return PollingWatcher(roots, on_change)
+
+
+# === Incremental Reloader ===
+# Per-blueprint handler registries Flask fills in when a blueprint is registered
+_BLUEPRINT_REGISTRIES = (
+    "before_request_funcs", "after_request_funcs", "teardown_request_funcs",
+    "url_value_preprocessors", "url_default_functions", "template_context_processors",
+    "error_handler_spec",
+)
+
+
+class DevReloader:
+    """Reloads only the changed modules/templates inside the running process.
+
+    The DB engine, its pool and untouched compiled templates stay warm.
+    """
+
+    def __init__(self, app, base_dir=BASE_DIR):
+        self.app = app
+        self.base_dir = Path(base_dir)
+        self.templates_dir = self.base_dir / "templates"
+        self._lock = threading.Lock()
+        self.watcher = None
+
+    def start(self):
+        roots = [self.base_dir / d for d in WATCH_DIRS if (self.base_dir / d).is_dir()]
+        self.watcher = make_watcher(roots, self.on_change)
+        kind = "inotify" if isinstance(self.watcher, InotifyWatcher) else "polling"
+        threading.Thread(target=self.watcher.run, name="dev-reloader", daemon=True).start()
+        print(f"👀 Watching {', '.join(r.name for r in roots)} for changes ({kind})...")
+        return self
+
+    def stop(self):
+        if self.watcher:
+            self.watcher.stop()
+
+    def _module_name(self, path):
+        rel = Path(path).resolve().relative_to(self.base_dir).with_suffix("")
+        parts = list(rel.parts)
+        if parts[-1] == "__init__":
+            parts.pop()
+        return ".".join(parts)
+
+    def on_change(self, paths):
+        templates, modules = [], []
+        for path in sorted(paths):
+            try:
+                if path.endswith(".html"):
+                    templates.append(Path(path).resolve().relative_to(self.templates_dir).as_posix())
+                else:
+                    modules.append(self._module_name(path))
+            except ValueError:
+                continue
+
+        with self._lock:
+            if templates:
+                self.evict_templates(templates)
+            if modules:
+                self.reload_modules(modules)
+
+    def evict_templates(self, names):
+        cache = self.app.jinja_env.cache
+        if cache is None:
+            return
+        for key in list(cache.keys()):
+            if key[1] in names:
+                try:
+                    del cache[key]
+                except KeyError:
+                    pass
+        print(f"🖼️ Template cache refreshed: {', '.join(names)}")
+
+    def reload_modules(self, names):
+        # Models first so controllers see fresh classes, routes last
+        order = {"models": 0, "controller": 1, "routes": 2}
+        if any(order.get(n.split(".")[0]) is None or n in RESTART_MODULES for n in names):
+            print("⚠️ Changed files outside controller/models/routes need a full restart.")
+            return
+
+        models = [n for n in names if _is_model_module(n)]
+        if models:
+            # Relationships resolve other models by name, so every loaded
+            # model is rebuilt together, then every controller holding them
+            loaded = [n for n in sys.modules if _is_model_module(n) or n.startswith("controller.")]
+            names = set(names) | set(loaded)
+            models = sorted(n for n in names if _is_model_module(n))
+            try:
+                for name in models:
+                    self._check_syntax(name)
+            except SyntaxError as e:
+                print(f"❌ Reload failed, keeping previous code: SyntaxError: {e}")
+                return
+        names = sorted(set(names), key=lambda n: order[n.split(".")[0]])
+
+        started = time.perf_counter()
+        try:
+            with self.app.app_context():
+                if models:
+                    self._rebuild_models(models)
+                for name in names:
+                    if name not in models:
+                        self._reload(name)
+                self.rebind_routes()
+        except Exception as e:
+            if models:
+                print(f"❌ Model reload failed, restart the server: {type(e).__name__}: {e}")
+            else:
+                print(f"❌ Reload failed, keeping previous code: {type(e).__name__}: {e}")
+            return
+        print(f"🔁 Reloaded {', '.join(names)} in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def _check_syntax(self, name):
+        path = self.base_dir.joinpath(*name.split(".")).with_suffix(".py")
+        if path.exists():
+            compile(path.read_text(), str(path), "exec")
+
+    def _rebuild_models(self, names):
+        from sqlalchemy.orm import configure_mappers
+        from models import db
+
+        # Drop the tables and unmap every class, then import fresh modules
+        # so models importing each other never pick up a disposed class
+        for name in names:
+            module = sys.modules.pop(name, None)
+            for value in (vars(module).values() if module else ()):
+                table = getattr(value, "__table__", None)
+                if isinstance(value, type) and value.__module__ == name and table is not None:
+                    db.metadata.remove(table)
+        db.Model.registry.dispose()
+        for name in names:
+            if self.base_dir.joinpath(*name.split(".")).with_suffix(".py").exists():
+                self._repoint(name, importlib.import_module(name))
+        configure_mappers()
+
+    def _reload(self, name):
+        module = sys.modules.get(name)
+        if module is None:
+            importlib.import_module(name)
+            return
+        self._repoint(name, importlib.reload(module))
+
+    def _repoint(self, name, module):
+        # Re-point names the package re-exports instead of re-running its
+        # __init__ (which would build a fresh `db` for models)
+        package = name.split(".")[0]
+        if name != package and package in sys.modules:
+            namespace = vars(sys.modules[package])
+            for attr, value in list(namespace.items()):
+                if getattr(value, "__module__", None) == name and hasattr(module, attr):
+                    namespace[attr] = getattr(module, attr)
+
+    def rebind_routes(self):
+        from flask import Flask
+        from routes import web
+        web = importlib.reload(web)
+        # Re-run setupRoute on a scratch app, so add_url_rule, route() and
+        # register_blueprint all behave as they did at startup
+        scratch = Flask(self.app.import_name, root_path=self.app.root_path, static_folder=None)
+        web.setupRoute(scratch)
+
+        app = self.app
+        for rule in scratch.url_map.iter_rules():
+            if rule.endpoint not in app.view_functions:
+                # Flask refuses add_url_rule after the first request; add the
+                # already-built rule to the live map instead
+                app.url_map.add(rule.empty())
+            app.view_functions[rule.endpoint] = scratch.view_functions[rule.endpoint]
+
+        app.blueprints.update(scratch.blueprints)
+        for registry in _BLUEPRINT_REGISTRIES:
+            live = getattr(app, registry)
+            for key, value in getattr(scratch, registry).items():
+                # None holds app-wide hooks (extensions etc.), left untouched
+                if key is not None:
+                    live[key] = value
+
+
+def _is_model_module(name):
+    return name.startswith("models.") and name not in RESTART_MODULES and name != "models._registry"
+
+
+# === Tailwind Supervisor ===
+class TailwindSupervisor:
+    """Owns the `tailwindcss --watch` child: restarts it if it dies and
+    kills its whole process group when the server exits."""
+
+    def __init__(self, max_restarts=5, stable_after=60):
+        self.max_restarts = max_restarts
+        # A child that ran this long (seconds) resets the restart budget
+        self.stable_after = stable_after
+        self.process = None
+        self._stopping = threading.Event()
+
+    def _spawn(self):
+        if platform.system() == "Windows":
+            env = os.environ.copy()
+            node_path = os.path.expanduser('~/scoop/apps/nodejs/current')
+            env['PATH'] = f"{node_path};{env['PATH']}"
+            return subprocess.Popen([
+                "powershell", "-Command",
+                "npx tailwindcss -i ./static/src/input.css -o ./static/css/output.css --watch=always"
+            ], env=env, creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+        return subprocess.Popen([
+            "npx", "tailwindcss",
+            "-i", "./static/src/input.css",
+            "-o", "./static/css/output.css",
+            # Plain --watch exits once stdin closes, and the child has none
+            "--watch=always"
+        ], stdin=subprocess.DEVNULL, start_new_session=True)
+
+    def start(self):
+        self.process = self._spawn()
+        threading.Thread(target=self._monitor, name="tailwind-supervisor", daemon=True).start()
+        atexit.register(self.stop)
+        if threading.current_thread() is threading.main_thread() and signal.getsignal(signal.SIGTERM) == signal.SIG_DFL:
+            # Turn SIGTERM into a normal exit so atexit reaps the child
+            signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        return self
+
+    def _monitor(self):
+        restarts = 0
+        while not self._stopping.is_set():
+            spawned = time.monotonic()
+            code = self.process.wait()
+            if self._stopping.is_set():
+                return
+            if time.monotonic() - spawned >= self.stable_after:
+                restarts = 0
+            if restarts >= self.max_restarts:
+                print(f"❌ Tailwind exited with code {code}; giving up after {restarts} restarts.")
+                return
+            restarts += 1
+            print(f"⚠️ Tailwind exited with code {code}, restarting ({restarts}/{self.max_restarts})...")
+            time.sleep(min(2 ** restarts, 30))
+            if not self._stopping.is_set():
+                self.process = self._spawn()
+
+    def stop(self, timeout=5):
+        self._stopping.set()
+        process = self.process
+        if process is None or process.poll() is not None:
+            return
+        try:
+            if platform.system() == "Windows":
+                subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)], capture_output=True)
+            else:
+                os.killpg(process.pid, signal.SIGTERM)
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            if platform.system() == "Windows":
+                process.kill()
+            else:
+                os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+        except ProcessLookupError:
+            pass
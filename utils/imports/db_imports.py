@@ -1,5 +1,5 @@
 from sqlalchemy import create_engine
 from sqlalchemy_utils import database_exists, create_database
 from flask_sqlalchemy import SQLAlchemy
-from models import db, Admin
-__all__ = ["create_engine", "database_exists", "create_database", "db", "Admin", "SQLAlchemy"]
+from models import db
+__all__ = ["create_engine", "database_exists", "create_database", "db", "SQLAlchemy"]
@@ -1,4 +1,4 @@
-from flask import Flask, current_app
+from flask import Flask, Blueprint, current_app, render_template, stream_template
 from flask_migrate import init, stamp, migrate, upgrade
 from flask_wtf import CSRFProtect
-__all__ = ["Flask", "current_app", "init", "stamp", "migrate", "upgrade", "CSRFProtect"]
+__all__ = ["Flask", "Blueprint", "current_app", "render_template", "stream_template", "init", "stamp", "migrate", "upgrade", "CSRFProtect"]
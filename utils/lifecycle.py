@@ -0,0 +1,221 @@
+# utils/lifecycle.py
+import json, os, signal, sys, threading, time
+
+from werkzeug.wsgi import ClosingIterator
+
+
+class _LifecycleMiddleware:
+    """Answers health probes before Flask, counts in-flight requests
+    (until the response body is closed) and rejects new ones once closing."""
+
+    def __init__(self, wsgi_app, lifecycle, live_path, ready_path):
+        self.wsgi_app = wsgi_app
+        self.lifecycle = lifecycle
+        self.live_path = live_path
+        self.ready_path = ready_path
+
+    def _respond(self, start_response, status, payload, headers=()):
+        body = json.dumps(payload).encode()
+        start_response(status, [
+            ("Content-Type", "application/json"),
+            ("Content-Length", str(len(body))),
+            ("Cache-Control", "no-store"),
+            *headers,
+        ])
+        return [body]
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        lifecycle = self.lifecycle
+        if path == self.live_path:
+            return self._respond(start_response, "200 OK", {"status": "alive"})
+        if path == self.ready_path:
+            state = lifecycle.state
+            status = "200 OK" if state == "ready" else "503 Service Unavailable"
+            return self._respond(start_response, status, {"status": state})
+        if lifecycle.closing:
+            return self._respond(start_response, "503 Service Unavailable", {"status": "draining"},
+                                 [("Connection", "close"), ("Retry-After", "1")])
+
+        lifecycle._enter()
+        try:
+            iterable = self.wsgi_app(environ, start_response)
+        except BaseException:
+            lifecycle._exit()
+            raise
+        return ClosingIterator(iterable, lifecycle._exit)
+
+
+class Lifecycle:
+    """Warmup, liveness/readiness probes and graceful SIGTERM drain.
+
+    Call `start(app)` once routes are registered: it warms the worker
+    (DB pool, models, templates, URL map) before reporting ready.
+
+    On SIGTERM only /readyz fails at first; requests keep being served for
+    DRAIN_GRACE_PERIOD so the load balancer can take the worker out. Then
+    the server's own handler (e.g. gunicorn's) stops accepting, or, with no
+    such handler, new requests get 503, and in-flight ones get DRAIN_TIMEOUT.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.ready = False
+        self.draining = False
+        self.closing = False
+        self._in_flight = 0
+        self._idle = threading.Condition()
+        self._drained = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("HEALTH_LIVE_PATH", "/healthz")
+        app.config.setdefault("HEALTH_READY_PATH", "/readyz")
+        app.config.setdefault("DRAIN_TIMEOUT", 30)
+        app.config.setdefault("DRAIN_GRACE_PERIOD", 5)
+        app.config.setdefault("WARMUP_RETRY_INTERVAL", 5)
+        self.app = app
+        app.extensions["lifecycle"] = self
+        app.wsgi_app = _LifecycleMiddleware(
+            app.wsgi_app, self, app.config["HEALTH_LIVE_PATH"], app.config["HEALTH_READY_PATH"]
+        )
+
+    @property
+    def state(self):
+        if self.draining:
+            return "draining"
+        return "ready" if self.ready else "warming"
+
+    def _enter(self):
+        with self._idle:
+            self._in_flight += 1
+
+    def _exit(self):
+        with self._idle:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._idle.notify_all()
+
+    # === Warmup ===
+    def start(self, app=None):
+        app = app or self.app
+        self._install_sigterm()
+        if not self.warmup(app):
+            threading.Thread(target=self._retry_warmup, args=(app,), name="warmup-retry", daemon=True).start()
+        return self
+
+    def _retry_warmup(self, app):
+        while not self.ready and not self.draining:
+            time.sleep(app.config["WARMUP_RETRY_INTERVAL"])
+            self.warmup(app)
+
+    def warmup(self, app):
+        from sqlalchemy import text
+        from sqlalchemy.orm import configure_mappers
+        from models import db, load_all
+        from models.search import sync_search_indexes
+
+        started = time.perf_counter()
+        try:
+            with app.app_context():
+                # Models + mappers, so the first query doesn't configure them
+                load_all()
+                configure_mappers()
+                sync_search_indexes()
+
+                # Fill the pool: open, ping, and return connections
+                engine = db.engine
+                connections = []
+                try:
+                    for _ in range(app.config.get("DB_POOL_SIZE", 1)):
+                        connection = engine.connect()
+                        connections.append(connection)
+                        connection.execute(text("SELECT 1"))
+                finally:
+                    for connection in connections:
+                        connection.close()
+
+                # Compile every template into the Jinja cache
+                env = app.jinja_env
+                for name in env.list_templates(filter_func=lambda n: n.endswith(".html")):
+                    env.get_template(name)
+
+                # Compile the URL map and build each route registered by setupRoute
+                adapter = app.url_map.bind("localhost")
+                for rule in app.url_map.iter_rules():
+                    if not rule.arguments and "GET" in (rule.methods or ()):
+                        try:
+                            adapter.match(rule.rule, method="GET")
+                        except Exception:
+                            # Redirects/host rules: the map is compiled either way
+                            pass
+        except Exception as e:
+            print(f"⚠️ Warmup failed, not ready yet: {type(e).__name__}: {e}")
+            return False
+
+        self.ready = True
+        print(f"🔥 Worker {os.getpid()} warmed up in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return True
+
+    # === Graceful Drain ===
+    def _install_sigterm(self):
+        if threading.current_thread() is not threading.main_thread():
+            return
+        previous = signal.getsignal(signal.SIGTERM)
+
+        def handle_sigterm(signum, frame):
+            if self._drained.is_set():
+                # Hand over to the server's own handler, or exit cleanly
+                if callable(previous):
+                    previous(signum, frame)
+                elif previous != signal.SIG_IGN:
+                    sys.exit(0)
+                return
+            if self.draining:
+                return
+            # Keep serving while /readyz reports draining; the main thread may
+            # be mid-request (sync workers), so wait from another thread and
+            # re-deliver SIGTERM when it's time to stop.
+            self.draining = True
+            threading.Thread(
+                target=self._drain_and_exit, args=(callable(previous),), name="drain", daemon=True
+            ).start()
+
+        signal.signal(signal.SIGTERM, handle_sigterm)
+
+    def drain(self, timeout=None):
+        """Wait for in-flight requests, then dispose the DB engine.
+
+        Returns False if requests were still running at the deadline.
+        """
+        from models import db
+
+        self.draining = True
+        timeout = self.app.config["DRAIN_TIMEOUT"] if timeout is None else timeout
+        print(f"🛑 Draining {self._in_flight} in-flight request(s) (timeout {timeout}s)...")
+        with self._idle:
+            drained = self._idle.wait_for(lambda: self._in_flight == 0, timeout=timeout)
+        if not drained:
+            print(f"⚠️ Drain timeout: {self._in_flight} request(s) still running.")
+        with self.app.app_context():
+            db.engine.dispose()
+        print("✅ Drained, DB engine disposed.")
+        return drained
+
+    def _drain_and_exit(self, server_handler):
+        grace = self.app.config["DRAIN_GRACE_PERIOD"]
+        print(f"🛑 SIGTERM: not ready, still serving for {grace}s...")
+        time.sleep(grace)
+        if server_handler:
+            # The server stops accepting and finishes its requests itself
+            self._drained.set()
+            os.kill(os.getpid(), signal.SIGTERM)
+            self.drain()
+            return
+        self.closing = True
+        try:
+            self.drain()
+        finally:
+            self._drained.set()
+            os.kill(os.getpid(), signal.SIGTERM)
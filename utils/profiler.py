@@ -0,0 +1,138 @@
+# utils/profiler.py
+import os, random, sys, threading, time
+from collections import Counter
+
+from flask import g, request
+
+PROFILE_SALT = "request-profiler"
+
+
+# === Stack Sampler ===
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack every `interval` seconds and counts
+    collapsed stacks (root;...;leaf)."""
+
+    def __init__(self, thread_id, interval, root):
+        super().__init__(name="request-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.root = root
+        self.stacks = Counter()
+        self._done = threading.Event()
+
+    def _frame_name(self, code):
+        filename = code.co_filename
+        if filename.startswith(self.root):
+            filename = os.path.relpath(filename, self.root)
+        return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                names.append(self._frame_name(frame.f_code))
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        return self.stacks
+
+
+# === Flask Extension ===
+class Profiler:
+    """Profiles a PROFILE_SAMPLE_RATE fraction of requests, plus any request
+    whose PROFILE_HEADER carries a token signed by the app serializer.
+
+    Collapsed stacks land in PROFILE_DIR/<endpoint>/. Unsampled requests only
+    pay for one random() call and a header lookup.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("PROFILE_SAMPLE_RATE", 0.0)
+        app.config.setdefault("PROFILE_INTERVAL", 0.005)
+        app.config.setdefault("PROFILE_HEADER", "X-Profile")
+        app.config.setdefault("PROFILE_TOKEN_MAX_AGE", 3600)
+        app.config.setdefault("PROFILE_DIR", os.path.abspath(os.path.join("instance", "profiles")))
+        app.extensions["profiler"] = self
+        app.before_request(lambda: self.start(app))
+        app.teardown_request(lambda exc: self.finish(app))
+
+    def _should_sample(self, app):
+        config = app.config
+        token = request.headers.get(config["PROFILE_HEADER"])
+        if token:
+            return verify_token(token, config["PROFILE_TOKEN_MAX_AGE"])
+        rate = config["PROFILE_SAMPLE_RATE"]
+        return rate > 0 and random.random() < rate
+
+    def start(self, app):
+        if not self._should_sample(app):
+            return
+        sampler = StackSampler(threading.get_ident(), app.config["PROFILE_INTERVAL"], app.root_path)
+        g._profile = (sampler, time.perf_counter())
+        sampler.start()
+
+    def finish(self, app):
+        profile = g.pop("_profile", None)
+        if profile is None:
+            return
+        sampler, started = profile
+        stacks = sampler.stop()
+        if not stacks:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        endpoint = (request.endpoint or "unknown").replace("/", "_")
+        directory = os.path.join(app.config["PROFILE_DIR"], endpoint)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{time.time():.6f}-{os.getpid()}-{duration_ms:.0f}ms.folded")
+            with open(path, "w") as f:
+                for stack, count in stacks.items():
+                    f.write(f"{stack} {count}\n")
+        except OSError as e:
+            print(f"⚠️ Failed to write profile: {e}")
+
+
+# === Signed Header ===
+def make_token():
+    import app_factory
+    return app_factory.serializer.dumps({"profile": True}, salt=PROFILE_SALT)
+
+
+def verify_token(token, max_age):
+    import app_factory
+    try:
+        return app_factory.serializer.loads(token, salt=PROFILE_SALT, max_age=max_age).get("profile") is True
+    except Exception:
+        return False
+
+
+# === Report ===
+def aggregate_profiles(profile_dir, endpoint=None):
+    """Sum collapsed stacks per endpoint: {endpoint: (profiles, Counter)}."""
+    results = {}
+    if not os.path.isdir(profile_dir):
+        return results
+    for name in sorted(os.listdir(profile_dir)):
+        directory = os.path.join(profile_dir, name)
+        if not os.path.isdir(directory) or (endpoint and name != endpoint):
+            continue
+        stacks = Counter()
+        files = [f for f in os.listdir(directory) if f.endswith(".folded")]
+        for filename in files:
+            with open(os.path.join(directory, filename), "r") as f:
+                for line in f:
+                    stack, _, count = line.rstrip("\n").rpartition(" ")
+                    if stack and count.isdigit():
+                        stacks[stack] += int(count)
+        if stacks:
+            results[name] = (len(files), stacks)
+    return results
@@ -0,0 +1,89 @@
+# utils/scripts/benchmark.py
+import time, zlib
+
+from flask import Flask, render_template, stream_template
+from jinja2 import DictLoader
+
+from utils.compression import Compress
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <link rel="stylesheet" href="/static/css/output.css">
+    <title>Benchmark</title>
+</head>
+<body>
+    <table>
+    {% for row in rows %}
+        <tr><td>{{ row.id }}</td><td>{{ row.name }}</td><td>{{ row.email }}</td></tr>
+    {% endfor %}
+    </table>
+</body>
+</html>"""
+
+
+def _rows(count, delay, first_delay):
+    # Simulates a cursor: the query runs before the first row, then rows
+    # arrive while the page is rendering
+    time.sleep(first_delay)
+    for i in range(count):
+        if delay and i % 100 == 0:
+            time.sleep(delay)
+        yield {"id": i, "name": f"User {i}", "email": f"user{i}@example.com"}
+
+
+def _bench_app(rows, delay, first_delay):
+    app = Flask(__name__)
+    app.jinja_loader = DictLoader({"page.html": PAGE})
+    Compress(app)
+
+    @app.route("/buffered")
+    def buffered():
+        return render_template("page.html", rows=_rows(rows, delay, first_delay))
+
+    @app.route("/streamed")
+    def streamed():
+        return stream_template("page.html", rows=_rows(rows, delay, first_delay))
+
+    return app
+
+
+def _measure(client, path, gzip):
+    headers = {"Accept-Encoding": "gzip" if gzip else "identity"}
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) if gzip else None
+    started = time.perf_counter()
+    response = client.get(path, headers=headers, buffered=False)
+    ttfb = head = None
+    body = b""
+    transferred = 0
+    for chunk in response.response:
+        now = time.perf_counter() - started
+        if chunk and ttfb is None:
+            ttfb = now
+        transferred += len(chunk)
+        if head is None:
+            body += decoder.decompress(chunk) if decoder else chunk
+            if b"</head>" in body:
+                head = now
+    total = time.perf_counter() - started
+    response.close()
+    return ttfb or total, head or total, total, transferred
+
+
+def run_render_benchmark(rows=5000, delay=0.002, first_delay=0.2, repeat=5):
+    """Compare time-to-first-byte, time until </head> arrives and bytes sent
+    for buffered vs streamed rendering, with and without gzip."""
+    app = _bench_app(rows, delay, first_delay)
+    client = app.test_client()
+    print(
+        f"📊 Rendering {rows} rows ({first_delay * 1000:.0f} ms before the first row, "
+        f"{delay * 1000:.1f} ms per 100 rows), best of {repeat}\n"
+    )
+    print(f"   {'mode':<18} {'TTFB':>10} {'</head>':>10} {'total':>10} {'bytes':>10}")
+    for path in ("/buffered", "/streamed"):
+        for gzip in (False, True):
+            results = [_measure(client, path, gzip) for _ in range(repeat)]
+            ttfb, head, total = (min(r[i] for r in results) for i in range(3))
+            label = f"{path.strip('/')}{' + gzip' if gzip else ''}"
+            print(f"   {label:<18} {ttfb * 1000:8.1f}ms {head * 1000:8.1f}ms {total * 1000:8.1f}ms {results[0][3]:>10}")
@@ -1,14 +1,17 @@
+import ast, re
+
 try:    
     from utils.imports import *
-    from models import Admin, db
+    from models import db
+    from utils.config import compile_snapshot, publish_reload, SNAPSHOT_PATH
     from .setup import setup
     from pathlib import Path
 except ImportError:
     from pathlib import Path
     from .setup import setup
 
-def run_setup():
-    setup()
+def run_setup(force=False):
+    setup(force=force)
     try:
         generate_env()
     except Exception as e:
@@ -24,6 +27,91 @@ def add_requirements(requirement):
     elif os_type == "Windows":
         subprocess.run(["uv", "add", requirement], check=True)
 
+# === 🗂️ Lazy Package Registry ===
+_EAGER_IMPORT_RE = re.compile(r"^from \.([\w.]+) import (\w+)\s*$")
+_ALL_APPEND_RE = re.compile(r"""^__all__\.append\(['"](\w+)['"]\)\s*$""")
+
+def _read_registry(registry_path):
+    if not os.path.exists(registry_path):
+        return {}
+    with open(registry_path, 'r') as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "REGISTRY" for t in node.targets):
+            return ast.literal_eval(node.value)
+    return {}
+
+def _write_registry(registry_path, registry, command):
+    lines = [f"# Generated by `{command}`. Maps class name -> module, imported lazily.", "REGISTRY = {"]
+    lines += [f"    {name!r}: {module!r},".replace("'", '"') for name, module in sorted(registry.items())]
+    lines.append("}")
+    with open(registry_path, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+
+def _wire_base_model(header):
+    """Make `db` build its models on BaseModel in a kept models/__init__ header."""
+    if "model_class=BaseModel" in header:
+        return header
+    header = re.sub(r"SQLAlchemy\(\s*\)", "SQLAlchemy(model_class=BaseModel)", header)
+    if "from .base import BaseModel" not in header:
+        lines = header.splitlines()
+        at = next((i + 1 for i, line in enumerate(lines) if line.startswith("from flask_sqlalchemy")), 0)
+        lines[at:at] = ["", "from .base import BaseModel"]
+        header = "\n".join(lines)
+    return header
+
+def register_lazy(package_dir, class_name, module_path, header="", rewrite=None):
+    """Record `class_name` in the package registry; convert eager __init__ files.
+
+    `header` seeds a missing __init__ as-is; `rewrite` patches the header kept
+    when an existing eager __init__ is converted.
+    """
+    base_dir = Path(__file__).resolve().parents[2]
+    init_path = os.path.join(package_dir, '__init__.py')
+    registry_path = os.path.join(package_dir, '_registry.py')
+    command = f"create:{'model' if os.path.basename(package_dir) == 'models' else 'controller'}"
+    registry = _read_registry(registry_path)
+
+    init_content = None
+    if os.path.exists(init_path):
+        with open(init_path, 'r') as f:
+            init_content = f.read()
+
+    if init_content is None:
+        kept_header = header.strip()
+    elif "_registry" not in init_content:
+        # Only `from .x import X` lines paired with `__all__.append('X')` are
+        # registrations; any other import stays in the kept header
+        lines = init_content.splitlines()
+        registered = {m.group(1) for m in map(_ALL_APPEND_RE.match, lines) if m}
+        kept = []
+        for line in lines:
+            match = _EAGER_IMPORT_RE.match(line)
+            if match and match.group(2) in registered:
+                registry.setdefault(match.group(2), match.group(1))
+            elif not (_ALL_APPEND_RE.match(line) or line.startswith("__all__ = ")):
+                kept.append(line)
+        kept_header = "\n".join(kept).strip()
+        if rewrite:
+            kept_header = rewrite(kept_header)
+
+    if init_content is None or "_registry" not in init_content:
+        template_path = os.path.join(base_dir, 'utils', 'scripts', 'template', 'PackageInit.txt')
+        with open(template_path, 'r') as f:
+            template = f.read()
+        with open(init_path, 'w') as f:
+            f.write(template.replace('{header}', f"{kept_header}\n\n" if kept_header else ""))
+
+    if registry.get(class_name) == module_path and os.path.exists(registry_path):
+        return False
+    registry[class_name] = module_path
+    _write_registry(registry_path, registry, command)
+    return True
+
+def load_all_models():
+    import models
+    return models.load_all()
+
 # === 📄 .env Generator Command ===
 def generate_env(force=False):
     example_path = '.env.example'
@@ -104,28 +192,19 @@ def create_controller(name):
 
     print(f"✅ Created: controller/{file_name}")
 
-    # 🔁 Auto-register in __init__.py
-    import_line = f"from .{file_stem} import {class_name}"
-    append_line = f"__all__.append('{class_name}')"
-
-    # 📄 Read or create __init__.py
-    if not os.path.exists(init_path):
-        with open(init_path, 'w') as f:
-            f.write("__all__ = []\n")
-
-    with open(init_path, 'r') as f:
-        init_content = f.read()
-
-    if import_line not in init_content:
-        with open(init_path, 'a') as f:
-            if not init_content.endswith('\n'):
-                f.write('\n')
-            f.write(f"{import_line}\n{append_line}\n")
-        print(f"🔗 Registered {class_name} in controller/__init__.py")
+    # 🔁 Auto-register in the lazy registry
+    if register_lazy(controller_dir, class_name, file_stem):
+        print(f"🔗 Registered {class_name} in controller/_registry.py")
     else:
-        print(f"ℹ️ {class_name} already registered in controller/__init__.py")
+        print(f"ℹ️ {class_name} already registered in controller/_registry.py")
+
+def create_model(name, searchable=None):
+    fields = [f.strip() for f in (searchable or "").split(",") if f.strip()]
+    invalid = [f for f in fields if not f.isidentifier() or f == "id"]
+    if invalid:
+        print(f"❌ Invalid searchable field(s): {', '.join(invalid)}")
+        return
 
-def create_model(name):
     if '/' in name or '\\' in name:
         path = name.replace('/', '.').replace('\\', '.')
         name = path.split('.')[-1]
@@ -139,7 +218,8 @@ def create_model(name):
 
     base_dir = Path(__file__).resolve().parents[2]
     model_dir = os.path.join(base_dir, 'models')
-    template_path = os.path.join(base_dir, 'utils', 'scripts', 'template', 'Model.txt')
+    template_name = 'SearchableModel.txt' if fields else 'Model.txt'
+    template_path = os.path.join(base_dir, 'utils', 'scripts', 'template', template_name)
     output_path = os.path.join(model_dir, file_name)
     init_path = os.path.join(model_dir, '__init__.py')
 
@@ -152,30 +232,21 @@ def create_model(name):
         template = f.read()
 
     content = template.replace('{className}', class_name).replace('{name}', name.lower())
+    if fields:
+        content = (content
+            .replace('{fields}', ', '.join(fields))
+            .replace('{searchable}', ', '.join(f"'{f}'" for f in fields))
+            .replace('{columns}', '\n'.join(f"    {f} = db.Column(db.Text)" for f in fields)))
 
     with open(output_path, 'w') as f:
         f.write(content)
 
     print(f"✅ Created: models/{file_name}")
 
-    import_line = f"from .{file_stem} import {class_name}"
-    append_line = f"__all__.append('{class_name}')"
-
-    if not os.path.exists(init_path):
-        with open(init_path, 'w') as f:
-            f.write("from flask_sqlalchemy import SQLAlchemy\ndb = SQLAlchemy()\n__all__ = []\n")
-
-    with open(init_path, 'r') as f:
-        init_content = f.read()
-
-    if import_line not in init_content:
-        with open(init_path, 'a') as f:
-            if not init_content.endswith('\n'):
-                f.write('\n')
-            f.write(f"{import_line}\n{append_line}\n")
-        print(f"🔗 Registered {class_name} in models/__init__.py")
+    if register_lazy(model_dir, class_name, file_stem, header="from flask_sqlalchemy import SQLAlchemy\n\nfrom .base import BaseModel\n\ndb = SQLAlchemy(model_class=BaseModel)\n\n", rewrite=_wire_base_model):
+        print(f"🔗 Registered {class_name} in models/_registry.py")
     else:
-        print(f"ℹ️ {class_name} already registered in models/__init__.py")
+        print(f"ℹ️ {class_name} already registered in models/_registry.py")
 
 def migrate_init():
     migrations_path = os.path.join(current_app.root_path, 'migrations')
@@ -220,6 +291,12 @@ def migrate_commit_and_apply(message):
 
     # Only proceed to autogenerate if upgrade was successful or handled
     print("\n📝 Checking for schema changes and generating new migration script...")
+    # Models load lazily; autogenerate needs every table in the metadata
+    load_all_models()
+    # Migrations only create the tables; build search indexes for any now present
+    from models.search import sync_search_indexes
+    for name in sync_search_indexes():
+        print(f"🔎 Built the search index for {name}.")
     commit_msg = message if message and message != "Default migration message" else None
     try:
         # Autogenerate will only create a script if there are actual model changes
@@ -338,6 +415,9 @@ def create_admin(email, password, post="Core Member"):
         print("❌ Email and password are required to create an admin.")
         return
 
+    # Imported here so other commands don't load the model at startup
+    from models import Admin
+
     try:
         # Check if admin already exists
         existing_admin = Admin.query.filter_by(email=email).first()
@@ -401,36 +481,123 @@ def drop_all_tables(app):
             
 def drop_table_by_name(app, model_name):
     with app.app_context():
-        from models import __all__ as model_list
         try:
+            # Load every model so foreign keys to this table are known
+            model_list = load_all_models()
             if model_name not in model_list:
                 print(f"❌ No model named '{model_name}' found.")
                 return
-            model_class = getattr(__import__('models'), model_name)
+            model_class = model_list[model_name]
             model_class.__table__.drop(db.engine)
             print(f"✅ Dropped table: {model_name}")
         except Exception as e:
             print(f"❌ Failed to drop {model_name}: {e}")
 
+def sweep_sessions(app, batch_size=500):
+    store = getattr(app.session_interface, "store", None)
+    if store is None:
+        print("ℹ️ Server-side sessions are disabled (SESSION_BACKEND=cookie).")
+        return
+
+    print("🧹 Sweeping expired sessions...")
+    total = 0
+    try:
+        while True:
+            removed = store.sweep(batch_size)
+            total += removed
+            if removed < batch_size:
+                break
+        print(f"✅ Removed {total} expired session(s).")
+    except Exception as e:
+        print(f"❌ Failed to sweep sessions: {e}")
+
+def compile_config():
+    print("🧊 Compiling config snapshot...")
+    try:
+        compile_snapshot()
+        print(f"✅ Config snapshot written to {SNAPSHOT_PATH}")
+    except Exception as e:
+        print(f"❌ Invalid configuration: {e}")
+
+def reload_config():
+    print("🔄 Publishing reloadable config to running workers...")
+    try:
+        settings = publish_reload()
+        for key, value in settings.reloadable().items():
+            print(f"   {key.upper()}={value}")
+        print("✅ Workers will pick up the new values on their next request.")
+    except Exception as e:
+        print(f"❌ Invalid configuration, nothing published: {e}")
+
+def benchmark_render(rows=5000):
+    from .benchmark import run_render_benchmark
+    run_render_benchmark(rows=rows)
+
+def profile_report(app, endpoint=None, output=None, top=10):
+    from utils.profiler import aggregate_profiles
+    profile_dir = app.config["PROFILE_DIR"]
+    results = aggregate_profiles(profile_dir, endpoint)
+    if not results:
+        print(f"ℹ️ No profiles found in {profile_dir}")
+        return
+
+    lines = []
+    for name, (count, stacks) in results.items():
+        total = sum(stacks.values())
+        print(f"\n📈 {name}: {count} profile(s), {total} samples")
+        # Self time: samples where the frame is the leaf of the stack
+        leaves = {}
+        for stack, samples in stacks.items():
+            leaf = stack.rsplit(";", 1)[-1]
+            leaves[leaf] = leaves.get(leaf, 0) + samples
+        for leaf, samples in sorted(leaves.items(), key=lambda item: -item[1])[:top]:
+            print(f"   {samples / total:6.1%}  {leaf}")
+        # Endpoint as root frame so one flamegraph can hold every endpoint
+        lines += [f"{name};{stack} {samples}" for stack, samples in stacks.items()]
+
+    if output:
+        with open(output, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+        print(f"\n✅ Collapsed stacks written to {output} (feed to flamegraph.pl or speedscope)")
+
+def profile_token():
+    from utils.profiler import make_token
+    print("🔏 Send this header to profile a single request (valid for PROFILE_TOKEN_MAX_AGE):")
+    print(f"X-Profile: {make_token()}")
+
+def search_reindex(app, model_name=None, batch_size=1000):
+    from models.search import SearchableMixin
+    with app.app_context():
+        all_models = load_all_models()
+        targets = {name: cls for name, cls in all_models.items()
+                   if isinstance(cls, type) and issubclass(cls, SearchableMixin)}
+        if model_name:
+            if model_name not in targets:
+                print(f"❌ No searchable model named '{model_name}' found.")
+                return
+            targets = {model_name: targets[model_name]}
+        if not targets:
+            print("ℹ️ No searchable models registered.")
+            return
+
+        for name, cls in targets.items():
+            print(f"🔎 Reindexing {name} in batches of {batch_size}...")
+            try:
+                started = time.perf_counter()
+                total = cls.reindex(batch_size, progress=lambda n: print(f"   … {n} rows indexed"))
+                print(f"✅ {name}: {total} rows indexed in {time.perf_counter() - started:.2f}s")
+            except Exception as e:
+                print(f"❌ Failed to reindex {name}: {e}")
+
 def start_tailwind_watch():
+    from utils.devserver import TailwindSupervisor
     print("🎨 Starting Tailwind CSS in watch mode...")
-    os_type = platform.system()
     try:
-        if os_type == "Windows":
-            env = os.environ.copy()
-            node_path = os.path.expanduser('~/scoop/apps/nodejs/current')
-            env['PATH'] = f"{node_path};{env['PATH']}"
-            subprocess.Popen([
-                "powershell", "-Command",
-                "npx tailwindcss -i ./static/src/input.css -o ./static/css/output.css --watch"
-            ], env=env)
-        else:
-            subprocess.Popen([
-                "npx", "tailwindcss",
-                "-i", "./static/src/input.css",
-                "-o", "./static/css/output.css",
-                "--watch"
-            ])
+        return TailwindSupervisor().start()
     except Exception as e:
         print(f"⚠️ Tailwind watch failed to start: {e}")
-        
+        return None
+
+def start_dev_reloader(app):
+    from utils.devserver import DevReloader
+    return DevReloader(app).start()
@@ -5,6 +5,12 @@ import subprocess
 import platform
 import shutil
 import time
+import glob
+import fnmatch
+import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     import tomllib  # Python 3.11+
@@ -135,16 +141,134 @@ def run_build_steps(deps):
         run(cmd)
 
 
+# === Node Dependencies ===
+def install_node():
+    """Install npm packages (including the Tailwind CLI); the only step that runs npm."""
+    print("📦 Installing npm dependencies...")
+    run("npm ci" if os.path.exists("package-lock.json") else "npm install")
+
+
+# === Step Cache ===
+STATE_PATH = "./instance/setup_state.json"
+
+STEP_INPUTS = {
+    "system": ["system.toml"],
+    "python": ["uv.lock", "pyproject.toml"],
+    "node": ["package-lock.json", "package.json"],
+    # Every Tailwind content source (tailwind.config.js, v4 auto-detection)
+    "css": [
+        "static/src/input.css", "tailwind.config.js", "package-lock.json",
+        "templates/**/*.html", "static/js/**/*.js", "**/*.py",
+    ],
+}
+
+# Never hashed: dependency trees, VCS data and generated files
+FINGERPRINT_SKIP_DIRS = {".venv", "node_modules", "__pycache__", "instance"}
+
+STEP_OUTPUTS = {
+    "python": [".venv"],
+    "node": ["node_modules"],
+    "css": ["static/css/output.css"],
+}
+
+
+def _expand(pattern):
+    """Glob `pattern`; `dir/**/name` walks `dir` without entering skipped or hidden dirs."""
+    if "**/" not in pattern:
+        return glob.glob(pattern)
+    root, _, name = pattern.partition("**/")
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(root or "."):
+        dirnames[:] = [d for d in dirnames if d not in FINGERPRINT_SKIP_DIRS and not d.startswith(".")]
+        paths += [os.path.normpath(os.path.join(dirpath, f)) for f in fnmatch.filter(filenames, name)]
+    return paths
+
+
+def fingerprint(patterns):
+    """Hash the paths and contents of every file matching `patterns`."""
+    digest = hashlib.sha256()
+    for pattern in patterns:
+        for path in sorted(_expand(pattern)):
+            if not os.path.isfile(path):
+                continue
+            digest.update(path.encode())
+            with open(path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def load_state():
+    try:
+        with open(STATE_PATH, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+    with open(STATE_PATH, "w") as f:
+        json.dump(state, f, indent=2)
+
+
+class StepRunner:
+    """Runs named setup steps, skipping those whose inputs are unchanged."""
+
+    def __init__(self, force=False):
+        self.force = force
+        self.state = load_state()
+        self.timings = []
+        self._lock = threading.Lock()
+
+    def step(self, name, func, *args):
+        started = time.perf_counter()
+        digest = fingerprint(STEP_INPUTS.get(name, []))
+        outputs_ok = all(os.path.exists(p) for p in STEP_OUTPUTS.get(name, []))
+        if not self.force and outputs_ok and self.state.get(name) == digest:
+            print(f"⏭️ {name}: inputs unchanged, skipping.")
+            self.timings.append((name, "skipped", time.perf_counter() - started))
+            return
+        try:
+            func(*args)
+        except BaseException:
+            self.timings.append((name, "failed", time.perf_counter() - started))
+            raise
+        # Re-hash after the step: it may create or rewrite its own inputs
+        digest = fingerprint(STEP_INPUTS.get(name, []))
+        with self._lock:
+            self.state[name] = digest
+            save_state(self.state)
+        self.timings.append((name, "ran", time.perf_counter() - started))
+
+    def summary(self):
+        print("\n⏱️ Setup timing summary:")
+        for name, status, seconds in self.timings:
+            print(f"   {name:<8} {status:<8} {seconds:7.2f}s")
+
+
 # === Main Setup Runner ===
-def setup():
+def setup(force=False):
     """Main setup entry point."""
     print("🔧 Starting full environment setup...")
     deps = load_toml()
+    steps = StepRunner(force=force)
 
-    install_system(deps)
-    install_python()
-    ensure_tailwind_input()
-    run_build_steps(deps)
+    def node_pipeline():
+        steps.step("node", install_node)
+        ensure_tailwind_input()
+        steps.step("css", run_build_steps, deps)
+
+    try:
+        # System tools (uv, node) must exist before the rest can start
+        steps.step("system", install_system, deps)
+        # Also when the step was skipped: a fresh shell may lack /snap/bin etc.
+        refresh_env_path()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(steps.step, "python", install_python), pool.submit(node_pipeline)]
+            for future in futures:
+                future.result()
+    finally:
+        steps.summary()
 
     print("\n✅ Setup completed successfully! 🎉")
 
@@ -152,10 +276,10 @@ def setup():
 # === Entrypoint ===
 if __name__ == "__main__":
     try:
-        setup()
+        setup(force="--force" in sys.argv)
     except KeyboardInterrupt:
         print("\n❌ Setup interrupted by user.")
         sys.exit(1)
     except Exception as e:
         print(f"\n❌ Fatal error during setup: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
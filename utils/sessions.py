@@ -0,0 +1,362 @@
+# utils/sessions.py
+import os, re, secrets, threading, time
+from collections import OrderedDict
+
+from flask.sessions import SessionInterface, SessionMixin
+from flask.sessions import session_json_serializer
+from sqlalchemy.exc import IntegrityError
+
+_SID_RE = re.compile(r"[A-Za-z0-9_-]{43}")
+
+
+# === Lazy Session Object ===
+class ServerSideSession(SessionMixin):
+    """Session whose payload is fetched and decoded on first access only."""
+
+    def __init__(self, sid=None, loader=None):
+        self.sid = sid
+        self.new = loader is None
+        self.modified = False
+        self.accessed = False
+        self._loader = loader
+        self._data = None if loader else {}
+
+    @property
+    def data(self):
+        self.accessed = True
+        if self._data is None:
+            raw = self._loader()
+            if raw is None:
+                # Unknown or expired sid: never adopt a client-chosen id
+                self.sid = None
+            try:
+                self._data = session_json_serializer.loads(raw.decode()) if raw else {}
+            except Exception:
+                self._data = {}
+        return self._data
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+        self.modified = True
+
+    def __delitem__(self, key):
+        del self.data[key]
+        self.modified = True
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+
+# === In-Process Read-Through Cache ===
+class LocalCache:
+    """Small thread-safe LRU with a per-entry TTL."""
+
+    def __init__(self, maxsize=1024, ttl=5):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            value, stale_at = item
+            if stale_at < time.time():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._items[key] = (value, time.time() + self.ttl)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+
+
+# === Stores ===
+class DatabaseSessionStore:
+    """Stores sessions in the `sessions` table of the app database."""
+
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+
+    def get(self, sid):
+        t = self.table
+        with self.db.engine.connect() as conn:
+            row = conn.execute(
+                t.select().with_only_columns(t.c.data, t.c.expires_at).where(t.c.sid == sid)
+            ).first()
+        if row is None or row.expires_at < time.time():
+            return None
+        return row.data
+
+    def set(self, sid, data, expires_at):
+        t = self.table
+        values = {"data": data, "expires_at": expires_at}
+        with self.db.engine.begin() as conn:
+            result = conn.execute(t.update().where(t.c.sid == sid).values(**values))
+            if result.rowcount:
+                return
+        try:
+            with self.db.engine.begin() as conn:
+                conn.execute(t.insert().values(sid=sid, **values))
+        except IntegrityError:
+            # Another worker inserted the same sid first; last write wins
+            with self.db.engine.begin() as conn:
+                conn.execute(t.update().where(t.c.sid == sid).values(**values))
+
+    def touch(self, sid, expires_at):
+        """Push back the expiry of a live session; expired ones stay expired."""
+        t = self.table
+        with self.db.engine.begin() as conn:
+            conn.execute(
+                t.update().where(t.c.sid == sid, t.c.expires_at >= time.time()).values(expires_at=expires_at)
+            )
+
+    def delete(self, sid):
+        t = self.table
+        with self.db.engine.begin() as conn:
+            conn.execute(t.delete().where(t.c.sid == sid))
+
+    def sweep(self, batch_size=500):
+        """Delete up to `batch_size` expired sessions, return the count."""
+        t = self.table
+        with self.db.engine.begin() as conn:
+            sids = conn.execute(
+                t.select().with_only_columns(t.c.sid)
+                .where(t.c.expires_at < time.time())
+                .limit(batch_size)
+            ).scalars().all()
+            if sids:
+                conn.execute(t.delete().where(t.c.sid.in_(sids)))
+        return len(sids)
+
+
+class FileSessionStore:
+    """Stores one file per session in a directory shared by local workers.
+
+    The file mtime holds the expiry timestamp so sweeps only need `stat`.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, sid):
+        return os.path.join(self.directory, sid)
+
+    def get(self, sid):
+        path = self._path(sid)
+        try:
+            if os.stat(path).st_mtime < time.time():
+                return None
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, sid, data, expires_at):
+        path = self._path(sid)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.utime(tmp_path, (expires_at, expires_at))
+        os.replace(tmp_path, path)
+
+    def touch(self, sid, expires_at):
+        """Push back the expiry of a live session; expired ones stay expired."""
+        path = self._path(sid)
+        try:
+            if os.stat(path).st_mtime >= time.time():
+                os.utime(path, (expires_at, expires_at))
+        except FileNotFoundError:
+            pass
+
+    def delete(self, sid):
+        try:
+            os.remove(self._path(sid))
+        except FileNotFoundError:
+            pass
+
+    def sweep(self, batch_size=500):
+        """Delete up to `batch_size` expired session files, return the count."""
+        now = time.time()
+        removed = 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if removed >= batch_size:
+                    break
+                try:
+                    if entry.name.endswith(".tmp"):
+                        continue
+                    if entry.is_file() and entry.stat().st_mtime < now:
+                        os.remove(entry.path)
+                        removed += 1
+                except FileNotFoundError:
+                    continue
+        return removed
+
+
+# === Session Interface ===
+class ServerSessionInterface(SessionInterface):
+    def __init__(self, store, cache, sweep_interval=300, sweep_batch=500, refresh_interval=60):
+        self.store = store
+        self.cache = cache
+        # sids whose expiry this worker pushed back recently
+        self.refreshed = LocalCache(maxsize=cache.maxsize, ttl=refresh_interval)
+        self.sweep_interval = sweep_interval
+        self.sweep_batch = sweep_batch
+        self._next_sweep = time.time() + sweep_interval
+        self._sweep_lock = threading.Lock()
+
+    def _fetch(self, sid):
+        raw = self.cache.get(sid)
+        if raw is None:
+            raw = self.store.get(sid)
+            if raw is not None:
+                self.cache.set(sid, raw)
+        return raw
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if not sid or not _SID_RE.fullmatch(sid):
+            return ServerSideSession()
+        return ServerSideSession(sid, loader=lambda: self._fetch(sid))
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        secure = self.get_cookie_secure(app)
+        samesite = self.get_cookie_samesite(app)
+        httponly = self.get_cookie_httponly(app)
+
+        if session.accessed:
+            response.vary.add("Cookie")
+
+        # Untouched or read-only sessions never hit the store
+        if not session.modified:
+            self._maybe_refresh(app, session, response)
+            return
+
+        if session.sid:
+            # The payload may have come from this worker's cache; if another
+            # worker has since cleared the session, never write it back.
+            if self.store.get(session.sid) is None:
+                self.cache.delete(session.sid)
+                response.delete_cookie(
+                    name, domain=domain, path=path, secure=secure,
+                    samesite=samesite, httponly=httponly,
+                )
+                return
+
+        if not session:
+            if session.sid:
+                self.cache.delete(session.sid)
+                self.store.delete(session.sid)
+                response.delete_cookie(
+                    name, domain=domain, path=path, secure=secure,
+                    samesite=samesite, httponly=httponly,
+                )
+            return
+
+        sid = session.sid or secrets.token_urlsafe(32)
+        expires_at = time.time() + app.permanent_session_lifetime.total_seconds()
+        raw = session_json_serializer.dumps(dict(session)).encode()
+        self.store.set(sid, raw, expires_at)
+        self.cache.set(sid, raw)
+        self.refreshed.set(sid, True)
+
+        self._set_cookie(app, session, response, sid)
+        self._maybe_sweep()
+
+    def _set_cookie(self, app, session, response, sid):
+        response.set_cookie(
+            self.get_cookie_name(app), sid, expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app), domain=self.get_cookie_domain(app),
+            path=self.get_cookie_path(app), secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+
+    def _maybe_refresh(self, app, session, response):
+        """Honour SESSION_REFRESH_EACH_REQUEST for permanent sessions, touching
+        the store at most once per refresh interval per sid."""
+        sid = session.sid
+        if not sid or not app.config["SESSION_REFRESH_EACH_REQUEST"] or self.refreshed.get(sid):
+            return
+        # Reading `permanent` loads the payload (usually from the cache)
+        if not session.permanent or not session.sid:
+            return
+        self.store.touch(sid, time.time() + app.permanent_session_lifetime.total_seconds())
+        self.refreshed.set(sid, True)
+        response.vary.add("Cookie")
+        self._set_cookie(app, session, response, sid)
+
+    def _maybe_sweep(self):
+        """Sweep one batch of expired sessions at most once per interval."""
+        if self.sweep_interval <= 0 or time.time() < self._next_sweep:
+            return
+        if not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_sweep = time.time() + self.sweep_interval
+            self.store.sweep(self.sweep_batch)
+        except Exception as e:
+            print(f"⚠️ Session sweep failed: {e}")
+        finally:
+            self._sweep_lock.release()
+
+
+# === Flask Extension ===
+class ServerSession:
+    """Replaces Flask's signed-cookie sessions with a server-side store.
+
+    SESSION_BACKEND selects `database`, `filesystem` or `cookie` (Flask default).
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend = app.config.get("SESSION_BACKEND", "filesystem").lower()
+        if backend == "cookie":
+            return
+
+        if backend == "database":
+            from models import db, SessionRecord
+            store = DatabaseSessionStore(db, SessionRecord.__table__)
+        elif backend == "filesystem":
+            directory = app.config.get("SESSION_FILE_DIR") or os.path.abspath(os.path.join("instance", "sessions"))
+            store = FileSessionStore(directory)
+        else:
+            raise ValueError(f"Unsupported SESSION_BACKEND: {backend}")
+
+        cache = LocalCache(
+            maxsize=app.config.get("SESSION_CACHE_SIZE", 1024),
+            ttl=app.config.get("SESSION_CACHE_TTL", 5),
+        )
+        app.session_interface = ServerSessionInterface(
+            store, cache,
+            sweep_interval=app.config.get("SESSION_SWEEP_INTERVAL", 300),
+            sweep_batch=app.config.get("SESSION_SWEEP_BATCH", 500),
+            refresh_interval=app.config.get("SESSION_REFRESH_INTERVAL", 60),
+        )
+        app.extensions["server_session"] = self
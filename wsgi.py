@@ -0,0 +1,9 @@
+# wsgi.py — production entry point, e.g. `gunicorn wsgi:app`
+from app_factory import create_app
+from extensions import lifecycle
+from routes import web
+
+app = create_app()
+web.setupRoute(app)
+# Warm up before the worker reports ready; drains gracefully on SIGTERM
+lifecycle.start(app)